@@ -16,10 +16,11 @@ logging.basicConfig(
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.routes.example import router as example_router
 from app.routes.clone import router as clone_router
 
-app = FastAPI(title="Backend API")
+app = FastAPI(title="Backend API", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -32,6 +33,14 @@ app.add_middleware(
 app.include_router(example_router)
 app.include_router(clone_router)
 
+
+@app.on_event("shutdown")
+async def _close_browser_pool():
+    # Warm Chromium instances outlive individual scrapes; make sure they die
+    # with the server instead of lingering as orphaned processes
+    from app.services.scraper import shutdown_browser_pool
+    await shutdown_browser_pool()
+
 @app.get("/")
 def root():
     return {"message": "Backend is running 🚀"}
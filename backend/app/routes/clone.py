@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 import certifi
+import orjson
 
 # Fix SSL cert verification on macOS (Python can't find system certs)
 os.environ.setdefault("SSL_CERT_FILE", certifi.where())
@@ -48,8 +49,12 @@ class CloneRequest(BaseModel):
 
 
 def _sse_event(data: dict) -> str:
-    """Format a dict as an SSE data line."""
-    return f"data: {json.dumps(data)}\n\n"
+    """Format a dict as an SSE data line.
+
+    Uses orjson — the done event carries the full file tree plus screenshots,
+    where stdlib json is the serialization bottleneck.
+    """
+    return f"data: {orjson.dumps(data).decode('utf-8')}\n\n"
 
 
 def _log(msg: str) -> str:
@@ -137,12 +142,12 @@ async def clone_website(req: CloneRequest):
                 scrape_elapsed = time.time() - scrape_start
                 screenshots = scrape_data["screenshots"]
                 image_urls = scrape_data["image_urls"]
-                raw_html = scrape_data["raw_html"]
+                raw_html_len = scrape_data["raw_html_len"]
                 html = scrape_data["html"]
                 computed_styles = scrape_data["computed_styles"]
 
                 yield _log(f"Scraping complete in {scrape_elapsed:.1f}s — {len(screenshots)} screenshots, {len(image_urls)} images")
-                _db_update_clone(clone_id, status="generating", screenshot_count=len(screenshots), image_count=len(image_urls), html_raw_size=len(raw_html), html_cleaned_size=len(html))
+                _db_update_clone(clone_id, status="generating", screenshot_count=len(screenshots), image_count=len(image_urls), html_raw_size=raw_html_len, html_cleaned_size=len(html))
             except Exception as e:
                 logger.error("[scrape] FAILED for %s: %s\n%s", url_str, e, traceback.format_exc())
                 sandbox_task.cancel()
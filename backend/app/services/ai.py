@@ -27,6 +27,23 @@ def _extract_usage(response) -> dict:
     return {"tokens_in": tokens_in or 0, "tokens_out": tokens_out or 0}
 
 
+def _image_data_url(b64: str) -> str:
+    """Build an image data URL, sniffing the mime from the base64 prefix.
+
+    The scraper emits WebP via CDP with a JPEG fallback (older captures were
+    PNG); the first few base64 chars encode the magic bytes, so the right
+    content type costs a prefix check instead of threading a format flag
+    through every call site.
+    """
+    if b64.startswith("UklGR"):  # RIFF (WebP)
+        mime = "image/webp"
+    elif b64.startswith("/9j/"):  # JPEG SOI
+        mime = "image/jpeg"
+    else:
+        mime = "image/png"
+    return f"data:{mime};base64,{b64}"
+
+
 def _calc_cost(tokens_in: int, tokens_out: int, model: str) -> float:
     """Calculate USD cost from token counts and model name."""
     pricing = MODEL_PRICING.get(model, DEFAULT_PRICING)
@@ -958,7 +975,7 @@ async def _assemble_page(
         scroll_y = scroll_positions[idx] if idx < len(scroll_positions) else 0
         pct = int(scroll_y / total_height * 100) if total_height > 0 else 0
         content.append({"type": "text", "text": f"Page screenshot ({pct}% scroll):"})
-        content.append({"type": "image_url", "image_url": {"url": f"data:image/png;base64,{ss}"}})
+        content.append({"type": "image_url", "image_url": {"url": _image_data_url(ss)}})
     content.append({"type": "text", "text": prompt})
 
     t0 = time.time()
@@ -1044,7 +1061,7 @@ async def _run_section_agent(
                 pct = int(scroll_y / total_height * 100)
                 label += f" (scrolled to {pct}% - pixels {scroll_y}-{scroll_y + 720} of {total_height}px)"
         content.append({"type": "text", "text": label})
-        content.append({"type": "image_url", "image_url": {"url": f"data:image/png;base64,{ss}"}})
+        content.append({"type": "image_url", "image_url": {"url": _image_data_url(ss)}})
     content.append({"type": "text", "text": prompt})
 
     t0 = time.time()
@@ -1283,7 +1300,7 @@ async def generate_clone(
                 pct = int(scroll_y / total_height * 100)
                 label += f" (scrolled to {pct}% - pixels {scroll_y}-{scroll_y + 720} of {total_height}px)"
         content.append({"type": "text", "text": label})
-        content.append({"type": "image_url", "image_url": {"url": f"data:image/png;base64,{ss}"}})
+        content.append({"type": "image_url", "image_url": {"url": _image_data_url(ss)}})
     content.append({"type": "text", "text": prompt})
 
     if on_status:
@@ -1,120 +1,242 @@
 import asyncio
-import base64
+import binascii
+import gc
+import hashlib
 import logging
 import re
+import threading
 import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from typing import Any, Callable
 
 from playwright.async_api import async_playwright
 from playwright_stealth import Stealth
 
+try:
+    # Lexbor backend first — same node API, noticeably faster parse than the
+    # Modest engine on large documents
+    from selectolax.lexbor import LexborHTMLParser as _SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as _SelectolaxParser
+    except ImportError:  # C parser unavailable — regex cleaner below still works
+        _SelectolaxParser = None
+
 logger = logging.getLogger(__name__)
 
 VIEWPORT_WIDTH = 1280
 VIEWPORT_HEIGHT = 900
 MAX_SCREENSHOTS = 15
+SCREENSHOT_QUALITY = 60  # WebP/JPEG quality — screenshots are visual reference, not archival
 MAX_IMAGE_URLS = 100
 MAX_STRUCTURED_ELEMENTS = 300
+MAX_CLEAN_HTML_CHARS = 500_000  # Cap on cleaned HTML carried through the pipeline
 STEP_TIMEOUT = 10  # Max seconds per JS evaluation step
+SCRAPE_BUDGET = 120  # Hard wall-clock cap for one full page scrape
+POOL_SIZE = 2  # Max warm Chromium instances kept alive between scrapes
+MAX_PAGES_PER_BROWSER = 25  # Concurrent page cap per browser instance
+BROWSER_IDLE_TTL = 300  # Close browsers unused for this many seconds
+MAX_CONCURRENT_SCRAPES = 8  # In-flight page cap for scrape_pages batches
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/131.0.0.0 Safari/537.36"
+)
+
+# Requests dropped at the network layer. Images and fonts stay enabled —
+# the screenshots fed to the AI need them — but video/audio streams and
+# analytics beacons only burn navigation budget.
+BLOCKED_RESOURCE_TYPES = {"media"}
+BLOCKED_URL_HINTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "mixpanel.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "fullstory.com",
+    "clarity.ms",
+    "ads.linkedin.com",
+    "static.ads-twitter.com",
+    "analytics.tiktok.com",
+)
+
+
+# Patterns for _clean_html, compiled once at import — the cleaner runs them
+# against multi-MB documents, so per-call re-cache lookups add up
+_RE_SVG_PATH_D = re.compile(r'(\s+d="[^"]{500})[^"]*"')
+# One alternation handles every block-level removal (SVG stash, dead tags,
+# comments) so the document is scanned once instead of once per category
+_RE_STRIP_SCAN = re.compile(
+    r"(?P<svg><svg[\s\S]*?</svg>)"
+    r"|<(?:script|style|noscript)\b[\s\S]*?</(?:script|style|noscript)>"
+    r"|<!--[\s\S]*?-->",
+    re.IGNORECASE,
+)
+_RE_COMMENT = re.compile(r"<!--(?!SVG_PLACEHOLDER_)\s*[\s\S]*?-->")
+_RE_SVG_PLACEHOLDER = re.compile(r"<!--SVG_PLACEHOLDER_(\d+)-->")
+_RE_DATA_ATTR = re.compile(r"\s+data-[\w-]+=(?:\"[^\"]*\"|'[^']*')")
+_RE_ON_ATTR = re.compile(r'\s+on\w+="[^"]*"')
+_RE_ARIA_ATTR = re.compile(r'\s+aria-[\w-]+="[^"]*"')
+_RE_BLANK_LINES = re.compile(r"\n\s*\n+")
+_RE_SPACES = re.compile(r"  +")
+
+
+# LRU of cleaned documents keyed by a 16-byte blake2b of the input — retries
+# and re-previews of the same URL usually see byte-identical HTML. Guarded by
+# a lock since cleaning may run from worker threads.
+_CLEAN_CACHE: OrderedDict[bytes, str] = OrderedDict()
+_CLEAN_CACHE_MAX = 128
+_clean_cache_lock = threading.Lock()
+
+# Substrings whose absence proves a document has nothing for the cleaner to
+# do — no scripts/styles/comments and none of the stripped attribute families
+_CLEAN_MARKERS = ("<script", "<style", "<noscript", "<!--", " data-", " aria-", " on")
+_CLEAN_FAST_PATH_MAX = 2048
 
 
 def _clean_html(html: str) -> str:
     """Strip noise from HTML while preserving SVGs for logo/icon fidelity.
 
-    1. Extract all <svg>...</svg> blocks and replace with placeholders.
-    2. Remove <script>, <style>, <noscript> tags and their contents.
-    3. Remove HTML comments.
-    4. Remove data-* and event handler attributes.
-    5. Simplify inline styles (keep only layout-critical properties).
-    6. Collapse excessive whitespace.
-    7. Restore SVGs (but truncate absurdly long path data).
+    Prefers the selectolax tree walk (one C-level parse + node mutation);
+    falls back to the pure-regex pipeline when selectolax is unavailable.
+    Results are memoized by content hash across scrapes.
     """
-    # 1. Extract SVGs
-    svgs: list[str] = []
-
-    def _stash_svg(m: re.Match) -> str:
-        svg = m.group(0)
-        # Truncate very long SVG path data (>500 chars per path)
-        svg = re.sub(
-            r'(\s+d="[^"]{500})[^"]*"',
-            r'\1..."',
-            svg,
-        )
-        idx = len(svgs)
-        svgs.append(svg)
-        return f"<!--SVG_PLACEHOLDER_{idx}-->"
+    # Tiny documents (error pages, skeleton SPA shells) with none of the
+    # markers come back unchanged — str.__contains__ is far cheaper than a
+    # parse or regex scan, and there is nothing to cache
+    if len(html) < _CLEAN_FAST_PATH_MAX and not any(m in html for m in _CLEAN_MARKERS):
+        return html
+
+    key = hashlib.blake2b(html.encode("utf-8"), digest_size=16).digest()
+    with _clean_cache_lock:
+        cached = _CLEAN_CACHE.get(key)
+        if cached is not None:
+            _CLEAN_CACHE.move_to_end(key)
+            return cached
+
+    cleaned: str | None = None
+    if _SelectolaxParser is not None:
+        try:
+            cleaned = _clean_html_tree(html)
+        except Exception as e:
+            logger.warning("[scrape] selectolax clean failed, using regex: %s", e)
+    if cleaned is None:
+        cleaned = _clean_html_regex(html)
 
-    cleaned = re.sub(r"<svg[\s\S]*?</svg>", _stash_svg, html, flags=re.IGNORECASE)
+    with _clean_cache_lock:
+        _CLEAN_CACHE[key] = cleaned
+        if len(_CLEAN_CACHE) > _CLEAN_CACHE_MAX:
+            _CLEAN_CACHE.popitem(last=False)
+    return cleaned
 
-    # 2. Remove <script>, <style>, <noscript> with content
-    for tag in ("script", "style", "noscript"):
-        cleaned = re.sub(
-            rf"<{tag}[\s\S]*?</{tag}>", "", cleaned, flags=re.IGNORECASE
-        )
 
-    # 3. Remove HTML comments (but not our SVG placeholders)
-    cleaned = re.sub(r"<!--(?!SVG_PLACEHOLDER_)\s*[\s\S]*?-->", "", cleaned)
+def _clean_html_tree(html: str) -> str:
+    """Tree-based cleaner: parse once, drop dead nodes, strip noisy attributes.
 
-    # 4. Remove data-* and event handler attributes
-    cleaned = re.sub(r'\s+data-[\w-]+="[^"]*"', "", cleaned)
-    cleaned = re.sub(r"\s+data-[\w-]+=\'[^']*\'", "", cleaned)
-    cleaned = re.sub(r'\s+on\w+="[^"]*"', "", cleaned)
+    SVGs stay in the document (no placeholder round-trip); overly long path
+    data is truncated in place, matching the regex path's behaviour.
+    """
+    tree = _SelectolaxParser(html)
+    tree.strip_tags(["script", "style", "noscript"])
+    for node in tree.root.traverse(include_text=False):
+        attrs = node.attributes
+        if not attrs:
+            continue
+        for name, value in attrs.items():
+            if name.startswith(("data-", "aria-", "on")):
+                del node.attrs[name]
+            elif name == "d" and value and len(value) > 500:
+                node.attrs["d"] = value[:500] + "..."
+    cleaned = tree.html or ""
+    cleaned = _RE_COMMENT.sub("", cleaned)
+    cleaned = _RE_BLANK_LINES.sub("\n", cleaned)
+    cleaned = _RE_SPACES.sub(" ", cleaned)
+    return cleaned.strip()
 
-    # 5. Remove non-essential attributes (aria-*, role is sometimes useful but verbose)
-    cleaned = re.sub(r'\s+aria-[\w-]+="[^"]*"', "", cleaned)
 
-    # 6. Collapse whitespace
-    cleaned = re.sub(r"\n\s*\n+", "\n", cleaned)
-    cleaned = re.sub(r"  +", " ", cleaned)
+def _clean_html_regex(html: str) -> str:
+    """Regex-based cleaner (fallback when selectolax is not installed).
 
-    # 7. Restore SVGs
-    for i, svg in enumerate(svgs):
-        cleaned = cleaned.replace(f"<!--SVG_PLACEHOLDER_{i}-->", svg)
+    1. One scan: stash <svg> blocks (truncating absurdly long path data)
+       behind placeholders, drop <script>/<style>/<noscript> and comments,
+       and splice the kept fragments into a list joined once at the end.
+    2. Remove data-* and event handler attributes.
+    3. Remove non-essential aria-* attributes.
+    4. Collapse excessive whitespace.
+    5. Restore SVGs.
+    """
+    # 1. Single pass over the document: kept spans are appended to a list and
+    # joined once, instead of one full-size string rebuild per category
+    svgs: list[str] = []
+    parts: list[str] = []
+    pos = 0
+    for m in _RE_STRIP_SCAN.finditer(html):
+        parts.append(html[pos:m.start()])
+        if m.lastgroup == "svg":
+            idx = len(svgs)
+            svgs.append(_RE_SVG_PATH_D.sub(r'\1..."', m.group(0)))
+            parts.append(f"<!--SVG_PLACEHOLDER_{idx}-->")
+        pos = m.end()
+    parts.append(html[pos:])
+    cleaned = "".join(parts)
+
+    # 2. Remove data-* (either quote style) and event handler attributes
+    cleaned = _RE_DATA_ATTR.sub("", cleaned)
+    cleaned = _RE_ON_ATTR.sub("", cleaned)
+
+    # 3. Remove non-essential attributes (aria-*, role is sometimes useful but verbose)
+    cleaned = _RE_ARIA_ATTR.sub("", cleaned)
+
+    # 4. Collapse whitespace
+    cleaned = _RE_BLANK_LINES.sub("\n", cleaned)
+    cleaned = _RE_SPACES.sub(" ", cleaned)
+
+    # 5. Restore SVGs — one substitution pass indexing into the stash,
+    # instead of one full-document scan per SVG
+    if svgs:
+        cleaned = _RE_SVG_PLACEHOLDER.sub(lambda m: svgs[int(m.group(1))], cleaned)
 
     return cleaned.strip()
 
 
 # JavaScript to extract computed styles from the page
 _JS_EXTRACT_STYLES = """() => {
+    const __css = window.__scrapeCss || getComputedStyle;
     const result = {};
 
-    // CSS custom properties from :root
-    const rootStyles = getComputedStyle(document.documentElement);
-    const customProps = {};
-    for (const sheet of document.styleSheets) {
-        try {
-            for (const rule of sheet.cssRules) {
-                if (rule.selectorText === ':root' || rule.selectorText === ':root, :host') {
-                    for (let i = 0; i < rule.style.length; i++) {
-                        const prop = rule.style[i];
-                        if (prop.startsWith('--')) {
-                            customProps[prop] = rule.style.getPropertyValue(prop).trim();
-                        }
-                    }
-                }
-            }
-        } catch(e) {} // cross-origin sheets
-    }
-    result.cssVariables = customProps;
+    // CSS custom properties from :root — served by the shared sheet scan
+    const sheets = window.__scrapeSheets
+        ? window.__scrapeSheets()
+        : { customProps: {}, fontFaceRules: [], importLinks: [] };
+    result.cssVariables = sheets.customProps;
 
     // Font families from prominent elements
     const fonts = new Set();
     for (const sel of ['body', 'h1', 'h2', 'h3', 'p', 'a', 'button', 'nav']) {
         const el = document.querySelector(sel);
-        if (el) fonts.add(getComputedStyle(el).fontFamily);
+        if (el) fonts.add(__css(el).fontFamily);
     }
     result.fonts = [...fonts];
 
     // Key colors
     const body = document.body;
-    const bodyStyle = getComputedStyle(body);
+    const bodyStyle = __css(body);
     result.bodyBg = bodyStyle.backgroundColor;
     result.bodyColor = bodyStyle.color;
 
     // Nav/header colors
     const header = document.querySelector('header, nav, [role="banner"]');
     if (header) {
-        const hs = getComputedStyle(header);
+        const hs = __css(header);
         result.headerBg = hs.backgroundColor;
         result.headerColor = hs.color;
     }
@@ -122,7 +244,7 @@ _JS_EXTRACT_STYLES = """() => {
     // Footer colors
     const footer = document.querySelector('footer, [role="contentinfo"]');
     if (footer) {
-        const fs = getComputedStyle(footer);
+        const fs = __css(footer);
         result.footerBg = fs.backgroundColor;
         result.footerColor = fs.color;
     }
@@ -130,7 +252,7 @@ _JS_EXTRACT_STYLES = """() => {
     // Primary button colors (first button with a bg)
     const btns = document.querySelectorAll('button, a.btn, [role="button"]');
     for (const btn of btns) {
-        const bs = getComputedStyle(btn);
+        const bs = __css(btn);
         if (bs.backgroundColor && bs.backgroundColor !== 'rgba(0, 0, 0, 0)') {
             result.primaryBtnBg = bs.backgroundColor;
             result.primaryBtnColor = bs.color;
@@ -171,19 +293,30 @@ _JS_EXTRACT_CONTENT = """(maxElements) => {
 
 # JavaScript to extract navigation/menu structures including dropdowns
 _JS_EXTRACT_NAV = """() => {
+    const __css = window.__scrapeCss || getComputedStyle;
+    const svgPrefix = window.__scrapeSvgPrefix || ((svg, limit) => svg.outerHTML.substring(0, limit));
     const navs = [];
     const navEls = document.querySelectorAll('nav, [role="navigation"], header');
 
+    // Selector literals hoisted out of the loops — one parsed-selector cache
+    // entry per string instead of per-iteration concatenation
+    const TOP_ITEM_SEL =
+        ':scope > ul > li, :scope > div > ul > li, ' +
+        ':scope > div > div > a, :scope > div > div > button, ' +
+        'li, [role="menuitem"]';
+    const DROPDOWN_SEL =
+        'ul, [role="menu"], div[class*="dropdown"], div[class*="popover"], ' +
+        'div[class*="panel"], div[class*="mega"], div[class*="submenu"], div[class*="flyout"]';
+    const SIBLING_PANEL_SEL =
+        'div[class*="dropdown"], div[class*="popover"], div[class*="panel"], ' +
+        'div[class*="mega"], [role="menu"]';
+
     for (const nav of navEls) {
         const navItem = { items: [] };
         const seen = new Set();
 
         // Find top-level nav items: direct links/buttons in the nav
-        const topCandidates = nav.querySelectorAll(
-            ':scope > ul > li, :scope > div > ul > li, ' +
-            ':scope > div > div > a, :scope > div > div > button, ' +
-            'li, [role="menuitem"]'
-        );
+        const topCandidates = nav.querySelectorAll(TOP_ITEM_SEL);
 
         for (const li of topCandidates) {
             const link = li.querySelector(':scope > a, :scope > button') || li.closest('a') || li;
@@ -200,10 +333,7 @@ _JS_EXTRACT_NAV = """() => {
 
             // Check if this item has a dropdown/mega-menu panel
             // Look for: nested ul, aria-controlled panel, adjacent dropdown div, hidden sibling panels
-            let dropdownPanel = li.querySelector(
-                'ul, [role="menu"], div[class*="dropdown"], div[class*="popover"], ' +
-                'div[class*="panel"], div[class*="mega"], div[class*="submenu"], div[class*="flyout"]'
-            );
+            let dropdownPanel = li.querySelector(DROPDOWN_SEL);
             // Also check aria-controls for panel ID
             const trigger = li.querySelector('[aria-controls], [aria-expanded]') || li;
             if (!dropdownPanel) {
@@ -215,7 +345,7 @@ _JS_EXTRACT_NAV = """() => {
             // Check next sibling (some sites place dropdown as adjacent element)
             if (!dropdownPanel && li.nextElementSibling) {
                 const sib = li.nextElementSibling;
-                if (sib.matches && sib.matches('div[class*="dropdown"], div[class*="popover"], div[class*="panel"], div[class*="mega"], [role="menu"]')) {
+                if (sib.matches && sib.matches(SIBLING_PANEL_SEL)) {
                     dropdownPanel = sib;
                 }
             }
@@ -259,7 +389,7 @@ _JS_EXTRACT_NAV = """() => {
                             // Extract icon/SVG
                             const svg = a.querySelector('svg');
                             if (svg) {
-                                subItem.svgMarkup = svg.outerHTML.substring(0, 1500);
+                                subItem.svgMarkup = svgPrefix(svg, 1500);
                                 const vb = svg.getAttribute('viewBox');
                                 if (vb) subItem.svgViewBox = vb;
                             }
@@ -292,7 +422,7 @@ _JS_EXTRACT_NAV = """() => {
                         if (desc) subItem.description = desc.textContent?.trim().substring(0, 150);
                         const svg = a.querySelector('svg');
                         if (svg) {
-                            subItem.svgMarkup = svg.outerHTML.substring(0, 1500);
+                            subItem.svgMarkup = svgPrefix(svg, 1500);
                         }
                         const icon = a.querySelector('img');
                         if (icon) subItem.iconSrc = icon.src;
@@ -304,7 +434,7 @@ _JS_EXTRACT_NAV = """() => {
                     delete menuItem.dropdown;
                 } else {
                     // Extract dropdown panel styling
-                    const ps = getComputedStyle(dropdownPanel);
+                    const ps = __css(dropdownPanel);
                     const pr = dropdownPanel.getBoundingClientRect();
                     menuItem.panelStyle = {
                         backgroundColor: ps.backgroundColor,
@@ -329,33 +459,57 @@ _JS_EXTRACT_NAV = """() => {
 
 # JavaScript to extract carousel/slider/tab content (including hidden slides)
 _JS_EXTRACT_INTERACTIVE = """() => {
+    const __css = window.__scrapeCss || getComputedStyle;
+    const svgPrefix = window.__scrapeSvgPrefix || ((svg, limit) => svg.outerHTML.substring(0, limit));
     const results = [];
 
-    // Broad carousel/slider selectors — catches most carousel implementations
-    const carouselSelectors = [
-        '[class*="carousel"]', '[class*="slider"]', '[class*="swiper"]',
-        '[class*="slide"]', '[data-carousel]', '[data-slider]',
-        '[role="tabpanel"]', '[class*="testimonial"]',
-        '[class*="card-stack"]', '[class*="rotating"]',
-        '[class*="scroll"]', '[class*="horizontal"]', '[class*="marquee"]',
-        '[class*="track"]', '[class*="strip"]', '[class*="ticker"]'
+    // Page-wide budget for serialized SVG markup — slides were only bounded
+    // per carousel, so icon-heavy pages could push hundreds of KB over CDP
+    let svgBudget = 20;
+
+    // FNV-1a — dedup keys become small integers (SMI-tagged in V8) instead
+    // of concatenated description-length strings
+    const fnv = (s) => {
+        let h = 2166136261;
+        for (let i = 0; i < s.length; i++) {
+            h ^= s.charCodeAt(i);
+            h = Math.imul(h, 16777619);
+        }
+        return h >>> 0;
+    };
+
+    // Broad carousel/slider selectors — catches most carousel implementations.
+    // Pre-joined literal so the selector parser sees the same string identity
+    // every call instead of a fresh Array.join result
+    const CAROUSEL_SEL =
+        '[class*="carousel"],[class*="slider"],[class*="swiper"],' +
+        '[class*="slide"],[data-carousel],[data-slider],' +
+        '[role="tabpanel"],[class*="testimonial"],' +
+        '[class*="card-stack"],[class*="rotating"],' +
+        '[class*="scroll"],[class*="horizontal"],[class*="marquee"],' +
+        '[class*="track"],[class*="strip"],[class*="ticker"]';
+
+    // Slide selectors stay an ordered list (first match wins), but hoisted out
+    // of the container loop so the array isn't rebuilt per carousel
+    const SLIDE_SELECTORS = [
+        ':scope > div', ':scope > li', ':scope > article',
+        '[class*="slide"]', '[role="tabpanel"]', '[class*="item"]',
+        ':scope > a'
     ];
 
-    const containers = document.querySelectorAll(carouselSelectors.join(', '));
+    const containers = document.querySelectorAll(CAROUSEL_SEL);
     const seen = new Set();
 
     for (const container of containers) {
+        // Enough groups for any realistic page — stop walking candidates
+        // (and paying the style/rect reads below) once the budget is spent
+        if (results.length >= 20) break;
         // Skip if this is a child of an already-processed carousel
         if (seen.has(container) || [...seen].some(s => s.contains(container))) continue;
 
         // Find all slide-like children
-        const slideSelectors = [
-            ':scope > div', ':scope > li', ':scope > article',
-            '[class*="slide"]', '[role="tabpanel"]', '[class*="item"]',
-            ':scope > a'
-        ];
         let slides = [];
-        for (const sel of slideSelectors) {
+        for (const sel of SLIDE_SELECTORS) {
             const found = container.querySelectorAll(sel);
             if (found.length > 1) { slides = [...found]; break; }
         }
@@ -364,7 +518,7 @@ _JS_EXTRACT_INTERACTIVE = """() => {
         seen.add(container);
 
         // ── Container + card dimensions ──
-        const containerStyle = getComputedStyle(container);
+        const containerStyle = __css(container);
         const containerRect = container.getBoundingClientRect();
         const containerWidth = Math.round(containerRect.width);
         const containerHeight = Math.round(containerRect.height);
@@ -377,7 +531,7 @@ _JS_EXTRACT_INTERACTIVE = """() => {
         // ── Infinite scroll detection ──
         // Check for: CSS animations, transform on container/parent, duplicated content, overflow hidden
         const parentEl = container.parentElement;
-        const parentStyle = parentEl ? getComputedStyle(parentEl) : {};
+        const parentStyle = parentEl ? __css(parentEl) : {};
         const hasAnimation = containerStyle.animation !== 'none' && containerStyle.animation !== '';
         const hasTransform = containerStyle.transform !== 'none' && containerStyle.transform !== '';
         const parentHasOverflowHidden = parentStyle.overflow === 'hidden' || parentStyle.overflowX === 'hidden';
@@ -441,18 +595,22 @@ _JS_EXTRACT_INTERACTIVE = """() => {
             }
 
             // Deduplicate: skip slides with identical content (clones for infinite scroll)
-            const contentKey = (slideData.title || '') + '|' + (slideData.description || '') + '|' + (slideData.text || '') + '|' + (slideData.image || '');
-            if (contentKey.length > 1 && seenContent.has(contentKey)) continue;
-            if (contentKey.length > 1) seenContent.add(contentKey);
+            const hasContent = !!(slideData.title || slideData.description || slideData.text || slideData.image);
+            const contentKey = fnv(slideData.title || '')
+                ^ Math.imul(fnv(slideData.description || ''), 2654435761)
+                ^ Math.imul(fnv(slideData.text || ''), 40503)
+                ^ fnv(slideData.image || '');
+            if (hasContent && seenContent.has(contentKey)) continue;
+            if (hasContent) seenContent.add(contentKey);
 
             // ── SVG extraction — capture ALL SVGs inside each slide ──
             const svgs = slide.querySelectorAll('svg');
-            if (svgs.length > 0) {
+            if (svgs.length > 0 && svgBudget > 0) {
                 slideData.svgCount = svgs.length;
                 slideData.svgMarkups = [];
                 for (const svg of [...svgs].slice(0, 3)) {
-                    const markup = svg.outerHTML;
-                    slideData.svgMarkups.push(markup.substring(0, 2000));
+                    if (svgBudget-- <= 0) break;
+                    slideData.svgMarkups.push(svgPrefix(svg, 2000));
                     if (!slideData.svgViewBox) {
                         const vb = svg.getAttribute('viewBox');
                         if (vb) slideData.svgViewBox = vb;
@@ -474,7 +632,7 @@ _JS_EXTRACT_INTERACTIVE = """() => {
             }
 
             // ── Card styling per slide ──
-            const slideStyle = getComputedStyle(slide);
+            const slideStyle = __css(slide);
             slideData.cardStyle = {
                 backgroundColor: slideStyle.backgroundColor,
                 border: slideStyle.border,
@@ -542,26 +700,15 @@ _JS_EXTRACT_FONTS = """() => {
         }
     });
 
-    // 3. Scan all styleSheets for @font-face rules
-    for (const sheet of document.styleSheets) {
-        try {
-            for (const rule of sheet.cssRules) {
-                if (rule instanceof CSSFontFaceRule) {
-                    const family = rule.style.getPropertyValue('font-family').replace(/['"]/g, '').trim();
-                    const src = rule.style.getPropertyValue('src');
-                    const weight = rule.style.getPropertyValue('font-weight') || '400';
-                    const style = rule.style.getPropertyValue('font-style') || 'normal';
-                    if (family && src) {
-                        fontFaceRules.push({ family, src: src.substring(0, 500), weight, style });
-                    }
-                }
-                if (rule instanceof CSSImportRule && rule.href) {
-                    if (rule.href.includes('fonts.googleapis.com') || rule.href.includes('use.typekit.net')) {
-                        googleFontLinks.push(rule.href);
-                    }
-                }
-            }
-        } catch(e) {} // cross-origin sheets
+    // 3. @font-face rules and @import hrefs come from the shared sheet scan
+    const sheets = window.__scrapeSheets
+        ? window.__scrapeSheets()
+        : { customProps: {}, fontFaceRules: [], importLinks: [] };
+    fontFaceRules.push(...sheets.fontFaceRules);
+    for (const href of sheets.importLinks) {
+        if (href.includes('fonts.googleapis.com') || href.includes('use.typekit.net')) {
+            googleFontLinks.push(href);
+        }
     }
 
     return { googleFontLinks: [...new Set(googleFontLinks)], fontFaceRules: fontFaceRules.slice(0, 20) };
@@ -569,6 +716,7 @@ _JS_EXTRACT_FONTS = """() => {
 
 # JavaScript to extract image URLs with context
 _JS_EXTRACT_IMAGES = """(maxUrls) => {
+    const __css = window.__scrapeCss || getComputedStyle;
     const images = [];
     const seen = new Set();
     const add = (url, meta) => {
@@ -576,54 +724,318 @@ _JS_EXTRACT_IMAGES = """(maxUrls) => {
         seen.add(url);
         images.push({ url, ...meta });
     };
-    // img elements — with alt, dimensions, container context
-    document.querySelectorAll('img[src]').forEach(img => {
-        if (!img.src) return;
+    // img elements — with alt, dimensions, container context.
+    // closest() re-runs selector matching at every ancestor for every image;
+    // collecting candidate containers into Sets up front turns each lookup
+    // into a single parent-pointer chase with O(1) membership tests
+    const containerSet = new Set(document.querySelectorAll('section, article, div[class], header, footer, nav'));
+    const nearbySet = new Set(document.querySelectorAll('a, div, figure'));
+    const nearestIn = (el, set) => {
+        while (el && !set.has(el)) el = el.parentElement;
+        return el;
+    };
+    const classKeyCache = new WeakMap();
+    const classKey = (el) => {
+        let key = classKeyCache.get(el);
+        if (key === undefined) {
+            key = el.className?.split(' ').filter(c => c.length > 2).slice(0, 2).join('.') || '';
+            classKeyCache.set(el, key);
+        }
+        return key;
+    };
+    // Every loop bails as soon as the cap is reached — the per-element work
+    // (rect reads, ancestor chases, style resolution) is wasted once full
+    for (const img of document.querySelectorAll('img[src]')) {
+        if (images.length >= maxUrls) break;
+        if (!img.src) continue;
         const rect = img.getBoundingClientRect();
-        const parent = img.closest('section, article, div[class], header, footer, nav');
-        const nearby = img.closest('a, div, figure');
+        const parent = nearestIn(img, containerSet);
+        const nearby = nearestIn(img, nearbySet);
         const nearbyText = nearby ? nearby.textContent?.trim().substring(0, 60) : '';
         add(img.src, {
             alt: img.alt || '',
             width: Math.round(rect.width) || undefined,
             height: Math.round(rect.height) || undefined,
-            container: parent?.className?.split(' ').filter(c => c.length > 2).slice(0, 2).join('.') || '',
+            container: parent ? classKey(parent) : '',
             context: nearbyText || '',
         });
-    });
+    }
     // srcset entries
-    document.querySelectorAll('img[srcset], source[srcset]').forEach(el => {
-        el.srcset.split(',').forEach(s => {
+    for (const el of document.querySelectorAll('img[srcset], source[srcset]')) {
+        if (images.length >= maxUrls) break;
+        for (const s of el.srcset.split(',')) {
+            if (images.length >= maxUrls) break;
             const u = s.trim().split(/\\s+/)[0];
             try { const abs = new URL(u, location.href).href; add(abs, {}); } catch(e) {}
-        });
-    });
+        }
+    }
     // background-image URLs (scan key containers only, not every DOM node)
-    document.querySelectorAll('section, article, div[class*="hero"], div[class*="banner"], div[class*="bg"], div[class*="background"], div[class*="cover"], header, footer, [style*="background"]').forEach(el => {
-        const bg = getComputedStyle(el).backgroundImage;
+    for (const el of document.querySelectorAll('section, article, div[class*="hero"], div[class*="banner"], div[class*="bg"], div[class*="background"], div[class*="cover"], header, footer, [style*="background"]')) {
+        if (images.length >= maxUrls) break;
+        // Inline style first — reading it is a property access, while the
+        // computed fallback forces style resolution on the element
+        const bg = el.style.backgroundImage || __css(el).backgroundImage;
         const match = bg.match(/url\\(["']?([^"')]+)["']?\\)/);
         if (match && match[1]) {
             try { const abs = new URL(match[1], location.href).href; add(abs, { context: 'background-image' }); } catch(e) {}
         }
-    });
+    }
     // Favicon / icon links
-    document.querySelectorAll('link[rel*="icon"][href]').forEach(link => {
+    for (const link of document.querySelectorAll('link[rel*="icon"][href]')) {
+        if (images.length >= maxUrls) break;
         if (link.href) add(link.href, { context: 'favicon' });
-    });
-    return images.slice(0, maxUrls);
+    }
+    return images;
 }"""
 
 
+# JavaScript to wait for the next paint after a scroll (two rAF ticks) and for
+# any in-viewport images that are still loading — replaces a fixed sleep
+_JS_SETTLE_AFTER_SCROLL = """() => new Promise(resolve => {
+    requestAnimationFrame(() => requestAnimationFrame(() => {
+        const pending = [...document.images]
+            .filter(img => {
+                const r = img.getBoundingClientRect();
+                return r.bottom > 0 && r.top < innerHeight && !img.complete;
+            })
+            .map(img => new Promise(r => { img.onload = img.onerror = r; }));
+        Promise.all(pending).then(resolve);
+    }));
+})"""
+
+
+# Cookie-consent / overlay dismissal: one combined querySelectorAll walk
+# instead of a query per selector, clicking at most the first three visible
+# hits — a page rarely has more than one real consent layer, and the cap
+# keeps a pathological selector match from clicking through the whole page
+_JS_DISMISS_OVERLAYS = """() => {
+    const OVERLAY_SEL =
+        'button[id*="accept"], button[class*="accept"], ' +
+        'button[id*="consent"], button[class*="consent"], ' +
+        'button[id*="agree"], button[class*="agree"], ' +
+        '[data-testid*="accept"], [data-testid*="consent"], ' +
+        'button[aria-label*="Accept"], button[aria-label*="accept"], ' +
+        'button[aria-label*="Allow"], button[aria-label*="allow"], ' +
+        '[class*="cookie"] button, [id*="cookie"] button, ' +
+        '[class*="banner"] button:first-of-type, ' +
+        'button[aria-label*="Accept the use"], ' +
+        'tp-yt-paper-button[aria-label*="Agree"], ' +
+        'button.VfPpkd-LgbsSe[style*="background"], ' +
+        '#sp-cc-accept, input[name="accept"]';
+    let count = 0;
+    for (const el of document.querySelectorAll(OVERLAY_SEL)) {
+        if (el.offsetParent !== null) {
+            el.click();
+            if (++count >= 3) break;
+        }
+    }
+    return count;
+}"""
+
+
+# Lazy-load scroll driven entirely inside the page: hop to the bottom, then
+# treat the page as settled once neither the DOM (MutationObserver) nor the
+# scroll height has changed for two rounds. One CDP round-trip replaces the
+# old scroll/sleep/probe loop (~60 round-trips at a fixed 800ms per hop)
+_JS_LAZY_SCROLL = """async (maxRounds) => {
+    const sleep = (ms) => new Promise(r => setTimeout(r, ms));
+    let mutated = false;
+    const mo = new MutationObserver(() => { mutated = true; });
+    mo.observe(document.body, { childList: true, subtree: true });
+    let lastHeight = 0;
+    let stable = 0;
+    let rounds = 0;
+    for (let i = 0; i < maxRounds; i++) {
+        const h = document.body.scrollHeight;
+        if (h !== lastHeight) {
+            window.scrollTo(0, h);
+            lastHeight = h;
+            rounds++;
+        }
+        mutated = false;
+        await sleep(250);
+        if (!mutated && document.body.scrollHeight === lastHeight) {
+            if (++stable >= 2) break;
+        } else {
+            stable = 0;
+        }
+    }
+    mo.disconnect();
+    window.scrollTo(0, 0);
+    return { height: document.body.scrollHeight, rounds };
+}"""
+
+
+# Selector for nav/menu elements that may open dropdowns on hover/click
+_NAV_TRIGGER_SELECTOR = (
+    'nav a, nav button, header a, header button, '
+    '[role="navigation"] a, [role="navigation"] button, '
+    '[role="menuitem"], [aria-haspopup="true"], [aria-expanded]'
+)
+
+# Dropdown probe run entirely inside the page: synthetic mouseenter/mouseover
+# plus a click for popup-style triggers, with a short yield between items so
+# menu scripts get a turn. The old Python loop cost up to 7 CDP round-trips
+# and 400ms of sleeps per trigger; this is one round-trip for all of them
+_JS_PROBE_NAV = """async ([sel, maxCount, vh]) => {
+    const sleep = (ms) => new Promise(r => setTimeout(r, ms));
+    let triggered = 0;
+    for (const el of document.querySelectorAll(sel)) {
+        if (triggered >= maxCount) break;
+        const r = el.getBoundingClientRect();
+        if (r.width === 0 || r.height === 0 || r.top >= vh) continue;
+        el.dispatchEvent(new MouseEvent('mouseenter', { bubbles: true }));
+        el.dispatchEvent(new MouseEvent('mouseover', { bubbles: true }));
+        if (el.hasAttribute('aria-haspopup') || el.hasAttribute('aria-expanded') || el.tagName === 'BUTTON') {
+            try { el.click(); } catch (e) {}
+        }
+        triggered++;
+        await sleep(50);
+    }
+    return triggered;
+}"""
+
+
+# Bundle installed once per page via add_init_script: V8 parses/compiles the
+# extractor sources a single time and each evaluate then calls a tiny arrow
+# that hits the already-compiled function instead of re-shipping multi-kB JS
+_JS_EXTRACTOR_BUNDLE = f"""window.__scrapeCssCache = new WeakMap();
+window.__scrapeCss = (el) => {{
+    let s = window.__scrapeCssCache.get(el);
+    if (!s) {{ s = getComputedStyle(el); window.__scrapeCssCache.set(el, s); }}
+    return s;
+}};
+window.__scrapeSheetScan = null;
+window.__scrapeSheets = () => {{
+    // Walk document.styleSheets once and serve every extractor from the same
+    // result — :root custom props, @font-face rules and @import hrefs used
+    // to be collected by two separate O(sheets x rules) traversals
+    if (window.__scrapeSheetScan) return window.__scrapeSheetScan;
+    const customProps = {{}};
+    const fontFaceRules = [];
+    const importLinks = [];
+    for (const sheet of document.styleSheets) {{
+        try {{
+            for (const rule of sheet.cssRules) {{
+                if (rule instanceof CSSFontFaceRule) {{
+                    const family = rule.style.getPropertyValue('font-family').replace(/['"]/g, '').trim();
+                    const src = rule.style.getPropertyValue('src');
+                    const weight = rule.style.getPropertyValue('font-weight') || '400';
+                    const style = rule.style.getPropertyValue('font-style') || 'normal';
+                    if (family && src) {{
+                        fontFaceRules.push({{ family, src: src.substring(0, 500), weight, style }});
+                    }}
+                }} else if (rule instanceof CSSImportRule && rule.href) {{
+                    importLinks.push(rule.href);
+                }} else if (rule.selectorText === ':root' || rule.selectorText === ':root, :host') {{
+                    for (let i = 0; i < rule.style.length; i++) {{
+                        const prop = rule.style[i];
+                        if (prop.startsWith('--')) {{
+                            customProps[prop] = rule.style.getPropertyValue(prop).trim();
+                        }}
+                    }}
+                }}
+            }}
+        }} catch(e) {{}} // cross-origin sheets
+    }}
+    window.__scrapeSheetScan = {{ customProps, fontFaceRules, importLinks }};
+    return window.__scrapeSheetScan;
+}};
+window.__scrapeSvgPrefix = (svg, limit) => {{
+    // Probe path/points data length before serializing: outerHTML on a
+    // path-heavy icon materializes tens of KB that the prefix throws away
+    let est = 0;
+    for (const p of svg.querySelectorAll('path, polygon, polyline')) {{
+        est += (p.getAttribute('d') || p.getAttribute('points') || '').length;
+        if (est > 50000) {{
+            return '<svg viewBox="' + (svg.getAttribute('viewBox') || '')
+                + '"><!-- ' + svg.childElementCount + ' children truncated --></svg>';
+        }}
+    }}
+    const raw = svg.outerHTML;
+    return raw.length > limit ? raw.substring(0, limit) : raw;
+}};
+window.__scrape = {{
+    extractStyles: {_JS_EXTRACT_STYLES},
+    extractContent: {_JS_EXTRACT_CONTENT},
+    extractNav: {_JS_EXTRACT_NAV},
+    extractInteractive: {_JS_EXTRACT_INTERACTIVE},
+    extractFonts: {_JS_EXTRACT_FONTS},
+    extractImages: {_JS_EXTRACT_IMAGES},
+    dismissOverlays: {_JS_DISMISS_OVERLAYS},
+    lazyScroll: {_JS_LAZY_SCROLL},
+    probeNav: {_JS_PROBE_NAV},
+    settle: {_JS_SETTLE_AFTER_SCROLL},
+    // Combined entry points: one CDP round-trip per phase instead of one per
+    // extractor. Nav extraction stays separate — it has to run after the
+    // dropdown probe but before dropdowns are closed again.
+    extractPre: (maxElements) => ({{
+        styles: window.__scrape.extractStyles(),
+        content: window.__scrape.extractContent(maxElements),
+    }}),
+    extractPost: (maxUrls) => {{
+        // The screenshot plan rides along so the capture phase starts without
+        // its own scrollHeight round-trip (each read also forces layout)
+        const height = document.body.scrollHeight;
+        const vh = window.innerHeight;
+        const positions = [];
+        for (let y = 0; y < height; y += vh) positions.push(y);
+        return {{
+            interactive: window.__scrape.extractInteractive(),
+            fonts: window.__scrape.extractFonts(),
+            images: window.__scrape.extractImages(maxUrls),
+            shotPlan: {{ height, positions }},
+        }};
+    }},
+}};"""
+
+
+
+
 # Type alias for the callback functions
 LogCallback = Callable[[str], str]
 StatusCallback = Callable[[str, str], str]
 
 
+@asynccontextmanager
+async def _deadline(seconds: float):
+    """Bound a block of awaits with a timer on the current task.
+
+    asyncio.wait_for allocates a wrapper Task plus cancellation callback per
+    call; with dozens of guarded awaits per scrape that bookkeeping adds up.
+    asyncio.timeout just arms a timer on the running task.
+    """
+    async with asyncio.timeout(seconds):
+        yield
+
+
+def _with_js_deadline(script: str, timeout: float) -> str:
+    """Race a function-style script against a browser-side timer.
+
+    asyncio.wait_for only cancels the Python awaiter — the browser keeps
+    running the heavy JS and later evaluates queue behind it. Rejecting
+    inside the page makes the evaluation itself settle at the deadline.
+    """
+    ms = int(timeout * 1000)
+    return (
+        "(arg) => Promise.race(["
+        f"Promise.resolve(({script})(arg)), "
+        "new Promise((_, rej) => "
+        f"setTimeout(() => rej(new Error('evaluate deadline')), {ms}))"
+        "])"
+    )
+
+
 async def _safe_evaluate(page, script, arg=None, timeout=STEP_TIMEOUT, default=None):
     """Run page.evaluate with a hard timeout. Returns default on timeout/error."""
     try:
+        if script.lstrip().startswith(("(", "async")):
+            # Function-style source — enforce the deadline in the page too
+            script = _with_js_deadline(script, timeout)
         coro = page.evaluate(script, arg) if arg is not None else page.evaluate(script)
-        return await asyncio.wait_for(coro, timeout=timeout)
+        # Python-side backstop (slightly longer so the JS race wins)
+        async with _deadline(timeout + 1):
+            return await coro
     except asyncio.TimeoutError:
         logger.warning("[scrape] JS evaluation timed out after %ds", timeout)
         return default
@@ -632,6 +1044,437 @@ async def _safe_evaluate(page, script, arg=None, timeout=STEP_TIMEOUT, default=N
         return default
 
 
+class BrowserPool:
+    """Warm pool of headless Chromium instances shared across scrapes.
+
+    Launching Chromium costs 0.5-2s per scrape; the pool launches lazily,
+    routes each acquire to the browser with the fewest active pages, and
+    bounds concurrent pages per browser with a semaphore. A reaper task
+    closes browsers that sit idle past BROWSER_IDLE_TTL.
+    """
+
+    def __init__(self, size: int = POOL_SIZE):
+        self._size = size
+        self._playwright = None
+        self._entries: list[dict] = []
+        self._lock = asyncio.Lock()
+        self._reaper: asyncio.Task | None = None
+
+    async def acquire(self):
+        """Return (browser, release). Await release() when the scrape is done."""
+        async with self._lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+                self._reaper = asyncio.create_task(self._reap_idle())
+            self._entries = [e for e in self._entries if e["browser"].is_connected()]
+            entry = min(self._entries, key=lambda e: e["active"], default=None)
+            if entry is None or (entry["active"] > 0 and len(self._entries) < self._size):
+                browser = await self._playwright.chromium.launch(headless=True)
+                entry = {
+                    "browser": browser,
+                    "semaphore": asyncio.Semaphore(MAX_PAGES_PER_BROWSER),
+                    "active": 0,
+                    "last_used": time.time(),
+                }
+                self._entries.append(entry)
+        await entry["semaphore"].acquire()
+        entry["active"] += 1
+        entry["last_used"] = time.time()
+
+        async def release():
+            entry["active"] -= 1
+            entry["last_used"] = time.time()
+            entry["semaphore"].release()
+
+        return entry["browser"], release
+
+    async def _reap_idle(self):
+        while True:
+            await asyncio.sleep(60)
+            async with self._lock:
+                now = time.time()
+                keep = []
+                for e in self._entries:
+                    if e["active"] == 0 and now - e["last_used"] > BROWSER_IDLE_TTL:
+                        try:
+                            await e["browser"].close()
+                        except Exception:
+                            pass
+                    else:
+                        keep.append(e)
+                self._entries = keep
+
+    async def close(self):
+        """Shut down every pooled browser and the Playwright driver."""
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+        for e in self._entries:
+            try:
+                await e["browser"].close()
+            except Exception:
+                pass
+        self._entries = []
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+_browser_pool = BrowserPool()
+
+
+async def shutdown_browser_pool() -> None:
+    """Close pooled browsers and the Playwright driver — call at app shutdown."""
+    await _browser_pool.close()
+
+
+async def _prepare_page(page):
+    """Apply stealth, the extractor bundle and request blocking to a fresh page.
+
+    Returns the page's CDP session, reused by the scrape flow for HTML and
+    screenshot commands.
+    """
+    await Stealth().apply_stealth_async(page)
+    cdp = await page.context.new_cdp_session(page)
+
+    # Static URL-pattern blocks are dropped inside the browser via CDP — no
+    # Python round-trip per request. The route filter below handles only what
+    # patterns can't express (resource types), plus the URL hints if the
+    # protocol call isn't available
+    url_hints: tuple[str, ...] = ()
+
+    async def _install_network_blocks():
+        nonlocal url_hints
+        try:
+            await cdp.send("Network.enable")
+            await cdp.send(
+                "Network.setBlockedURLs",
+                {"urls": [f"*{hint}*" for hint in BLOCKED_URL_HINTS]},
+            )
+        except Exception as e:
+            logger.warning("[scrape] Network.setBlockedURLs unavailable, blocking in route: %s", e)
+            url_hints = BLOCKED_URL_HINTS
+
+    async def _route_filter(route):
+        req = route.request
+        if req.resource_type in BLOCKED_RESOURCE_TYPES or any(
+            hint in req.url for hint in url_hints
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    # Independent setup calls — no request fires until goto(), so let the
+    # init-script install, network blocks and route registration overlap
+    # instead of paying three sequential round-trips
+    await asyncio.gather(
+        page.add_init_script(script=_JS_EXTRACTOR_BUNDLE),
+        _install_network_blocks(),
+        page.route("**/*", _route_filter),
+    )
+    return cdp
+
+
+async def _scrape_with_page(page, cdp, url: str, _log) -> dict[str, Any]:
+    """Run the full scrape flow against an already-prepared page.
+
+    Shared by scrape_page and scrape_pages. The caller owns the page and its
+    context — this never closes either.
+    """
+    nav_start = time.time()
+    _log("Navigating to page...")
+
+    try:
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+    except Exception as e:
+        _log(f"Navigation timeout ({e.__class__.__name__}), continuing with partial page...")
+
+    # Wait for the network to go quiet instead of a fixed hydration sleep —
+    # static pages settle in well under the old 2s, heavy ones are capped at 3s
+    try:
+        await page.wait_for_load_state("networkidle", timeout=3000)
+    except Exception:
+        pass  # still loading in the background — proceed with what's rendered
+    _log(f"Page loaded in {time.time() - nav_start:.1f}s")
+
+    # Dismiss cookie consent / overlay banners
+    _log("Dismissing overlays...")
+    dismissed = await _safe_evaluate(page, "() => window.__scrape.dismissOverlays()", default=0)
+    if dismissed:
+        # Wait for the dismissed layer to actually leave the DOM rather than
+        # sleeping a fixed second; fall through if it animates out slowly
+        try:
+            await page.wait_for_function(
+                """() => !document.querySelector(
+                    '[class*="overlay"]:not([aria-hidden="true"]), [class*="modal"][aria-hidden="false"]'
+                )""",
+                timeout=1500,
+            )
+        except Exception:
+            pass
+        _log(f"Dismissed {dismissed} overlay(s)")
+
+    # Scroll to bottom to trigger lazy-loaded content — the whole loop runs
+    # in-page and returns as soon as the DOM goes quiet
+    _log("Scrolling to trigger lazy-loaded content...")
+    scroll_start = time.time()
+    scroll_result: dict = await _safe_evaluate(
+        page, "(n) => window.__scrape.lazyScroll(n)", arg=30, default={}, timeout=30
+    )
+    scroll_count = scroll_result.get("rounds") or 0
+    final_height = scroll_result.get("height") or 0
+    _log(f"Scrolled {scroll_count}x in {time.time() - scroll_start:.1f}s — page height: {final_height:,}px")
+
+    # Capture HTML after all content is loaded
+    _log("Extracting HTML...")
+    try:
+        # DOM.getOuterHTML skips the extra serialized copy page.content()
+        # builds before handing the string over — one string in flight
+        async with _deadline(STEP_TIMEOUT):
+            doc = await cdp.send("DOM.getDocument", {"depth": -1, "pierce": False})
+        async with _deadline(STEP_TIMEOUT):
+            reply = await cdp.send("DOM.getOuterHTML", {"nodeId": doc["root"]["nodeId"]})
+        raw_html = reply["outerHTML"]
+    except Exception:
+        try:
+            async with _deadline(STEP_TIMEOUT):
+                raw_html = await page.content()
+        except asyncio.TimeoutError:
+            _log("HTML extraction timed out, using empty HTML")
+            raw_html = ""
+
+    # Clean on a worker thread — the cleaner is pure CPU and would otherwise
+    # stall every concurrent scrape on this loop — and overlap it with the
+    # next extraction round-trips. The task owns the raw string (2-10MB);
+    # nothing downstream needs more than its length
+    clean_start = time.time()
+    raw_html_len = len(raw_html)
+    clean_task = asyncio.create_task(asyncio.to_thread(_clean_html, raw_html))
+    del raw_html
+
+    # Extract computed styles + structured content in one round-trip
+    _log("Extracting computed styles and content structure...")
+    pre_bundle: dict | None = await _safe_evaluate(
+        page,
+        "(n) => window.__scrape.extractPre(n)",
+        arg=MAX_STRUCTURED_ELEMENTS,
+        default=None,
+    )
+    if pre_bundle is None:
+        # Combined call failed — fall back per extractor so one bad
+        # extractor can't blank out the others. The calls are independent,
+        # so let them overlap on the CDP channel instead of awaiting each
+        computed_styles, structured_content = await asyncio.gather(
+            _safe_evaluate(
+                page, "() => window.__scrape.extractStyles()", default={}
+            ),
+            _safe_evaluate(
+                page,
+                "(n) => window.__scrape.extractContent(n)",
+                arg=MAX_STRUCTURED_ELEMENTS,
+                default=[],
+            ),
+        )
+    else:
+        computed_styles = pre_bundle.get("styles") or {}
+        structured_content = pre_bundle.get("content") or []
+    _log(f"Styles: {len(computed_styles.get('fonts', []))} fonts, {len(computed_styles.get('cssVariables', {}))} CSS vars")
+    _log(f"Found {len(structured_content)} content elements")
+
+    html = await clean_task
+    if len(html) > MAX_CLEAN_HTML_CHARS:
+        # The prompt builder reads only a prefix of this anyway — don't carry
+        # a pathological multi-MB skeleton through the rest of the pipeline
+        html = html[:MAX_CLEAN_HTML_CHARS]
+        _log(f"Cleaned HTML capped at {MAX_CLEAN_HTML_CHARS:,} chars")
+    reduction = 100 - len(html) * 100 // max(raw_html_len, 1)
+    _log(f"HTML cleaned: {raw_html_len:,} → {len(html):,} chars ({reduction}% reduction, {time.time() - clean_start:.1f}s overlapped)")
+
+    # Trigger navigation dropdowns
+    _log("Probing navigation dropdowns...")
+    try:
+        async with _deadline(5):
+            await page.evaluate("window.scrollTo(0, 0)")
+
+        triggered_count = await _safe_evaluate(
+            page,
+            "(a) => window.__scrape.probeNav(a)",
+            arg=[_NAV_TRIGGER_SELECTOR, 20, VIEWPORT_HEIGHT],
+            default=0,
+            timeout=10,
+        )
+        _log(f"Triggered {triggered_count} nav items for dropdown extraction")
+    except (asyncio.TimeoutError, Exception) as nav_err:
+        _log("Nav probing timed out, skipping")
+        logger.warning("[scrape] Nav trigger failed (non-fatal): %s", nav_err)
+
+    # Extract navigation structure
+    nav_structure: list[dict] = await _safe_evaluate(
+        page, "() => window.__scrape.extractNav()", default=[]
+    )
+    total_dropdown_items = sum(
+        len(item.get("dropdown", []))
+        for nav in nav_structure
+        for item in nav.get("items", [])
+    )
+    _log(f"Navigation: {len(nav_structure)} nav(s), {total_dropdown_items} dropdown items")
+
+    # Close open dropdowns and reset page state
+    try:
+        async with _deadline(3):
+            await page.evaluate("document.body.click()")
+        await page.keyboard.press("Escape")
+        await page.evaluate("window.scrollTo(0, 0)")
+        # Two rAF ticks let the close/scroll paint before extraction — a real
+        # signal instead of the old 300ms + 200ms sleeps
+        await _safe_evaluate(page, "() => window.__scrape.settle()", default=None, timeout=2)
+    except Exception:
+        pass
+
+    # Extract interactive elements + fonts + images in one round-trip
+    _log("Extracting interactive elements, fonts and images...")
+    post_bundle: dict | None = await _safe_evaluate(
+        page,
+        "(n) => window.__scrape.extractPost(n)",
+        arg=MAX_IMAGE_URLS,
+        default=None,
+    )
+    shot_plan: dict | None = None
+    if post_bundle is None:
+        interactive_elements, font_data, image_urls = await asyncio.gather(
+            _safe_evaluate(
+                page, "() => window.__scrape.extractInteractive()", default=[]
+            ),
+            _safe_evaluate(
+                page,
+                "() => window.__scrape.extractFonts()",
+                default={"googleFontLinks": [], "fontFaceRules": []},
+            ),
+            _safe_evaluate(
+                page, "(n) => window.__scrape.extractImages(n)", arg=MAX_IMAGE_URLS, default=[]
+            ),
+        )
+    else:
+        interactive_elements = post_bundle.get("interactive") or []
+        font_data = post_bundle.get("fonts") or {"googleFontLinks": [], "fontFaceRules": []}
+        image_urls = post_bundle.get("images") or []
+        shot_plan = post_bundle.get("shotPlan")
+    total_slides = sum(el.get("slideCount", 0) for el in interactive_elements)
+    _log(f"Interactive: {len(interactive_elements)} groups, {total_slides} slides")
+    google_font_count = len(font_data.get("googleFontLinks", []))
+    font_face_count = len(font_data.get("fontFaceRules", []))
+    _log(f"Fonts: {google_font_count} Google Font links, {font_face_count} @font-face rules")
+    _log(f"Found {len(image_urls)} image URLs")
+
+    # Take screenshots
+    _log("Capturing screenshots...")
+    # The plan (height + every scroll offset) normally arrives with the post
+    # bundle; if that combined call fell back, synthesize it from the height
+    # the lazy scroll already measured — the viewport is fixed, so another
+    # scrollHeight round-trip (which also forces layout) buys nothing
+    if shot_plan is None:
+        height = final_height or VIEWPORT_HEIGHT
+        shot_plan = {
+            "height": height,
+            "positions": list(range(0, height, VIEWPORT_HEIGHT)) or [0],
+        }
+    total_height = shot_plan.get("height") or VIEWPORT_HEIGHT
+    screenshots: list[str] = []
+    scroll_positions: list[int] = []
+    prev_key: tuple[int, int] | None = None
+    duplicates = 0
+    screenshot_bytes = 0
+    use_webp = True
+
+    async def _capture(clip: dict) -> str | bytes:
+        """Capture one clip region: base64 WebP via CDP, raw JPEG bytes on fallback.
+
+        JPEG fallbacks come back unencoded — the caller batch-encodes them in
+        one thread hop instead of paying a to_thread dispatch per frame.
+        """
+        nonlocal use_webp
+        if use_webp:
+            try:
+                async with _deadline(10):
+                    reply = await cdp.send("Page.captureScreenshot", {
+                        "format": "webp",
+                        "quality": SCREENSHOT_QUALITY,
+                        "clip": {**clip, "scale": 1},
+                        "captureBeyondViewport": True,
+                    })
+                return reply["data"]  # already base64
+            except Exception:
+                use_webp = False  # WebP unsupported — stick with JPEG from here on
+        async with _deadline(10):
+            return await page.screenshot(type="jpeg", quality=SCREENSHOT_QUALITY, clip=clip)
+
+    # Every viewport below the fold was already scrolled through (and its
+    # images awaited) during the lazy-load pass, so clip-region captures can
+    # fire from a single page state — no scroll, no settle sleep between
+    # frames, and the browser pipelines the encodes back-to-back
+    await _safe_evaluate(page, "() => window.__scrape.settle()", default=None, timeout=2)
+    positions = list(shot_plan.get("positions") or [0])[:MAX_SCREENSHOTS]
+    clips = [
+        {
+            "x": 0,
+            "y": y,
+            "width": VIEWPORT_WIDTH,
+            "height": max(min(VIEWPORT_HEIGHT, total_height - y), 1),
+        }
+        for y in positions
+    ]
+    shots = await asyncio.gather(
+        *(_capture(clip) for clip in clips), return_exceptions=True
+    )
+    if any(isinstance(s, bytes) for s in shots):
+        # JPEG fallback frames arrive raw — encode the whole batch in one
+        # thread hop (b2a_base64 is the C fast path under base64.b64encode)
+        def _encode_batch() -> list:
+            return [
+                binascii.b2a_base64(s, newline=False).decode("ascii")
+                if isinstance(s, bytes) else s
+                for s in shots
+            ]
+
+        shots = await asyncio.to_thread(_encode_batch)
+    for offset, shot_b64 in zip(positions, shots):
+        if isinstance(shot_b64, BaseException):
+            _log(f"Screenshot at offset {offset} failed, stopping")
+            break
+        # Skip regions identical to the previous capture (blank/repeating
+        # stretches on long pages). Keying on length + the str hash avoids
+        # the bytes copy sha256 would need — the hash is computed in place
+        # and adjacent-frame dedup doesn't need cryptographic strength
+        shot_key = (len(shot_b64), hash(shot_b64))
+        if shot_key == prev_key:
+            duplicates += 1
+            continue
+        prev_key = shot_key
+        screenshots.append(shot_b64)
+        scroll_positions.append(offset)
+        # Tally sizes as frames land rather than re-walking the list at the
+        # end — screenshots are the largest payload in the return
+        screenshot_bytes += len(shot_b64)
+    if duplicates:
+        _log(f"Skipped {duplicates} duplicate screenshot(s)")
+
+    _log(f"Captured {len(screenshots)} screenshots ({screenshot_bytes / 1_048_576:.1f}MB), page height={total_height}px")
+
+    return {
+        "raw_html_len": raw_html_len,
+        "html": html,
+        "computed_styles": computed_styles,
+        "structured_content": structured_content,
+        "nav_structure": nav_structure,
+        "interactive_elements": interactive_elements,
+        "font_data": font_data,
+        "image_urls": image_urls,
+        "screenshots": screenshots,
+        "scroll_positions": scroll_positions,
+        "total_height": total_height,
+    }
+
+
 async def scrape_page(
     url: str,
     on_log: LogCallback,
@@ -648,9 +1491,9 @@ async def scrape_page(
                    so the SSE generator can stream them in real time.
 
     Returns:
-        Dict with keys: raw_html, html, computed_styles, structured_content,
-        nav_structure, interactive_elements, font_data, image_urls,
-        screenshots, scroll_positions, total_height.
+        Dict with keys: raw_html_len, html, computed_styles,
+        structured_content, nav_structure, interactive_elements, font_data,
+        image_urls, screenshots, scroll_positions, total_height.
     """
     def _log(msg: str) -> None:
         """Append a progress message for the frontend terminal."""
@@ -658,216 +1501,84 @@ async def scrape_page(
         if log_queue is not None:
             log_queue.append(msg)
 
-    result: dict[str, Any] = {}
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        _log(f"Browser launched for {url}")
+    browser, _release_browser = await _browser_pool.acquire()
+    page = None
+    try:
+        _log(f"Browser acquired for {url}")
         page = await browser.new_page(
             viewport={"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT},
-            user_agent=(
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
+            user_agent=USER_AGENT,
         )
-        await Stealth().apply_stealth_async(page)
-
-        nav_start = time.time()
-        _log("Navigating to page...")
+        # One deadline over the whole scrape: on expiry every in-flight child
+        # (navigation, JS steps, screenshot gathers) cancels atomically, so a
+        # pathological page can't hold the request open past the SLA
+        async with _deadline(SCRAPE_BUDGET):
+            cdp = await _prepare_page(page)
+            result = await _scrape_with_page(page, cdp, url, _log)
+        return result
+    finally:
+        # The browser is a warm pooled instance that outlives this scrape, so
+        # the page must die on timeout/error paths too or it leaks a renderer
+        # inside the shared Chromium
+        if page is not None:
+            try:
+                await page.close()
+            except Exception:
+                pass  # browser already disconnected — nothing left to close
+        # Playwright handles form reference cycles; reclaim them now rather
+        # than carrying them into the next scrape
+        gc.collect()
+        await _release_browser()
 
-        try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        except Exception as e:
-            _log(f"Navigation timeout ({e.__class__.__name__}), continuing with partial page...")
-
-        # Brief settle time for JS hydration / async renders
-        await page.wait_for_timeout(2000)
-        _log(f"Page loaded in {time.time() - nav_start:.1f}s")
-
-        # Dismiss cookie consent / overlay banners
-        _log("Dismissing overlays...")
-        dismissed = await _safe_evaluate(page, """() => {
-            const selectors = [
-                'button[id*="accept"]', 'button[class*="accept"]',
-                'button[id*="consent"]', 'button[class*="consent"]',
-                'button[id*="agree"]', 'button[class*="agree"]',
-                '[data-testid*="accept"]', '[data-testid*="consent"]',
-                'button[aria-label*="Accept"]', 'button[aria-label*="accept"]',
-                'button[aria-label*="Allow"]', 'button[aria-label*="allow"]',
-                '[class*="cookie"] button', '[id*="cookie"] button',
-                '[class*="banner"] button:first-of-type',
-                'button[aria-label*="Accept the use"]',
-                'tp-yt-paper-button[aria-label*="Agree"]',
-                'button.VfPpkd-LgbsSe[style*="background"]',
-                '#sp-cc-accept', 'input[name="accept"]',
-            ];
-            let count = 0;
-            for (const sel of selectors) {
-                const el = document.querySelector(sel);
-                if (el && el.offsetParent !== null) { el.click(); count++; }
-            }
-            return count;
-        }""", default=0)
-        if dismissed:
-            await page.wait_for_timeout(1000)
-            _log(f"Dismissed {dismissed} overlay(s)")
-
-        # Scroll to bottom to trigger lazy-loaded content
-        _log("Scrolling to trigger lazy-loaded content...")
-        scroll_start = time.time()
-        scroll_count = 0
-        prev_height = 0
-        for _ in range(30):
-            total_height = await _safe_evaluate(page, "document.body.scrollHeight", default=0, timeout=5)
-            if total_height == 0 or total_height == prev_height:
-                break
-            prev_height = total_height
-            await _safe_evaluate(page, "window.scrollTo(0, document.body.scrollHeight)", default=None, timeout=5)
-            await page.wait_for_timeout(800)
-            scroll_count += 1
-        # Scroll back to top
-        await _safe_evaluate(page, "window.scrollTo(0, 0)", default=None, timeout=5)
-        await page.wait_for_timeout(500)
-        final_height = await _safe_evaluate(page, "document.body.scrollHeight", default=prev_height, timeout=5)
-        _log(f"Scrolled {scroll_count}x in {time.time() - scroll_start:.1f}s — page height: {final_height:,}px")
-
-        # Capture HTML after all content is loaded
-        _log("Extracting HTML...")
-        try:
-            raw_html = await asyncio.wait_for(page.content(), timeout=STEP_TIMEOUT)
-        except asyncio.TimeoutError:
-            _log("HTML extraction timed out, using empty HTML")
-            raw_html = ""
 
-        # Clean HTML
-        clean_start = time.time()
-        html = _clean_html(raw_html)
-        reduction = 100 - len(html) * 100 // max(len(raw_html), 1)
-        _log(f"HTML cleaned: {len(raw_html):,} → {len(html):,} chars ({reduction}% reduction)")
-
-        # Extract computed styles
-        _log("Extracting computed styles...")
-        computed_styles: dict = await _safe_evaluate(page, _JS_EXTRACT_STYLES, default={})
-        _log(f"Styles: {len(computed_styles.get('fonts', []))} fonts, {len(computed_styles.get('cssVariables', {}))} CSS vars")
-
-        # Extract structured content
-        _log("Extracting page content structure...")
-        structured_content: list[dict] = await _safe_evaluate(
-            page, _JS_EXTRACT_CONTENT, arg=MAX_STRUCTURED_ELEMENTS, default=[]
-        )
-        _log(f"Found {len(structured_content)} content elements")
+async def scrape_pages(
+    urls: list[str],
+    log_queue: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Scrape several URLs concurrently against one pooled browser.
 
-        # Trigger navigation dropdowns
-        _log("Probing navigation dropdowns...")
-        try:
-            await asyncio.wait_for(page.evaluate("window.scrollTo(0, 0)"), timeout=5)
-            await page.wait_for_timeout(300)
-
-            nav_triggers = await asyncio.wait_for(
-                page.query_selector_all(
-                    'nav a, nav button, header a, header button, '
-                    '[role="navigation"] a, [role="navigation"] button, '
-                    '[role="menuitem"], [aria-haspopup="true"], [aria-expanded]'
-                ),
-                timeout=5,
-            )
-            triggered_count = 0
-            for trigger in nav_triggers[:20]:
-                try:
-                    is_visible = await trigger.is_visible()
-                    if not is_visible:
-                        continue
-                    box = await trigger.bounding_box()
-                    if not box or box["y"] > VIEWPORT_HEIGHT:
-                        continue
-
-                    await trigger.hover(timeout=1000)
-                    await page.wait_for_timeout(200)
-
-                    has_popup = await trigger.evaluate(
-                        "el => el.hasAttribute('aria-haspopup') || el.hasAttribute('aria-expanded') || el.tagName === 'BUTTON'"
-                    )
-                    if has_popup:
-                        await trigger.click(timeout=1000)
-                        await page.wait_for_timeout(200)
-
-                    triggered_count += 1
-                except Exception:
-                    continue
-
-            _log(f"Triggered {triggered_count} nav items for dropdown extraction")
-        except (asyncio.TimeoutError, Exception) as nav_err:
-            _log("Nav probing timed out, skipping")
-            logger.warning("[scrape] Nav trigger failed (non-fatal): %s", nav_err)
-
-        # Extract navigation structure
-        nav_structure: list[dict] = await _safe_evaluate(page, _JS_EXTRACT_NAV, default=[])
-        total_dropdown_items = sum(
-            len(item.get("dropdown", []))
-            for nav in nav_structure
-            for item in nav.get("items", [])
-        )
-        _log(f"Navigation: {len(nav_structure)} nav(s), {total_dropdown_items} dropdown items")
+    Each URL runs in its own incognito context so cookies and storage never
+    leak between sites, with at most MAX_CONCURRENT_SCRAPES in flight. A URL
+    that fails yields an {"url", "error"} dict in its slot rather than
+    cancelling the rest of the batch. Results come back in input order.
+    """
+    def _log(msg: str) -> None:
+        logger.info("[scrape] %s", msg)
+        if log_queue is not None:
+            log_queue.append(msg)
 
-        # Close open dropdowns and reset page state
-        try:
-            await asyncio.wait_for(page.evaluate("document.body.click()"), timeout=3)
-            await page.keyboard.press("Escape")
-            await page.wait_for_timeout(300)
-            await page.evaluate("window.scrollTo(0, 0)")
-            await page.wait_for_timeout(200)
-        except Exception:
-            pass
+    browser, _release_browser = await _browser_pool.acquire()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+    results: list[dict[str, Any]] = [{} for _ in urls]
 
-        # Extract interactive elements
-        _log("Extracting interactive elements...")
-        interactive_elements: list[dict] = await _safe_evaluate(page, _JS_EXTRACT_INTERACTIVE, default=[])
-        total_slides = sum(el.get("slideCount", 0) for el in interactive_elements)
-        _log(f"Interactive: {len(interactive_elements)} groups, {total_slides} slides")
-
-        # Extract font URLs
-        font_data: dict = await _safe_evaluate(page, _JS_EXTRACT_FONTS, default={"googleFontLinks": [], "fontFaceRules": []})
-        google_font_count = len(font_data.get("googleFontLinks", []))
-        font_face_count = len(font_data.get("fontFaceRules", []))
-        _log(f"Fonts: {google_font_count} Google Font links, {font_face_count} @font-face rules")
-
-        # Extract image URLs
-        image_urls: list[dict] = await _safe_evaluate(page, _JS_EXTRACT_IMAGES, arg=MAX_IMAGE_URLS, default=[])
-        _log(f"Found {len(image_urls)} image URLs")
-
-        # Take screenshots
-        _log("Capturing screenshots...")
-        total_height = await _safe_evaluate(page, "document.body.scrollHeight", default=VIEWPORT_HEIGHT)
-        screenshots: list[str] = []
-        scroll_positions: list[int] = []
-        scroll_offset = 0
-        while scroll_offset < total_height and len(screenshots) < MAX_SCREENSHOTS:
+    async def _scrape_one(index: int, url: str) -> None:
+        async with semaphore:
             try:
-                await asyncio.wait_for(page.evaluate(f"window.scrollTo(0, {scroll_offset})"), timeout=5)
-                await page.wait_for_timeout(600)
-                shot = await asyncio.wait_for(page.screenshot(full_page=False), timeout=10)
-                screenshots.append(base64.b64encode(shot).decode("utf-8"))
-                scroll_positions.append(scroll_offset)
-            except (asyncio.TimeoutError, Exception) as e:
-                _log(f"Screenshot at offset {scroll_offset} failed, stopping")
-                break
-            scroll_offset += VIEWPORT_HEIGHT
-
-        await browser.close()
-        screenshot_bytes = sum(len(s) for s in screenshots)
-        _log(f"Captured {len(screenshots)} screenshots ({screenshot_bytes / 1_048_576:.1f}MB), page height={total_height}px")
+                context = await browser.new_context(
+                    viewport={"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT},
+                    user_agent=USER_AGENT,
+                )
+                try:
+                    # Same per-page budget as scrape_page: one slow URL times
+                    # out into its error slot instead of stalling the batch
+                    async with _deadline(SCRAPE_BUDGET):
+                        page = await context.new_page()
+                        cdp = await _prepare_page(page)
+                        results[index] = await _scrape_with_page(
+                            page, cdp, url, _log
+                        )
+                finally:
+                    await context.close()
+            except Exception as e:
+                _log(f"Scrape failed for {url}: {e.__class__.__name__}")
+                logger.warning("[scrape] %s failed: %s", url, e)
+                results[index] = {"url": url, "error": str(e)}
 
-    return {
-        "raw_html": raw_html,
-        "html": html,
-        "computed_styles": computed_styles,
-        "structured_content": structured_content,
-        "nav_structure": nav_structure,
-        "interactive_elements": interactive_elements,
-        "font_data": font_data,
-        "image_urls": image_urls,
-        "screenshots": screenshots,
-        "scroll_positions": scroll_positions,
-        "total_height": total_height,
-    }
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for i, url in enumerate(urls):
+                tg.create_task(_scrape_one(i, url))
+    finally:
+        gc.collect()
+        await _release_browser()
+    return results